@@ -1,34 +1,97 @@
+import heapq
 import random
 import networkx as nx
+import numpy as np
+import scipy.sparse as sp
 from collections import defaultdict
 
+# ----------------------------------------------------------------------
+# helper: precomputed single-source distances, one per terminal
+# ----------------------------------------------------------------------
+def terminal_distances(G, terminals, weight="weight"):
+    """
+    Full Dijkstra from every terminal, done once.
+    Returns {terminal : (dists, verts)} — two parallel lists sorted by
+    distance, so that a ball of any radius is a prefix and the lazy
+    k-way heap merge in `sample_partition` can walk each list in order.
+    """
+    D = {}
+    for t in terminals:
+        lengths = nx.single_source_dijkstra_path_length(G, t, weight=weight)
+        order = sorted(lengths, key=lengths.get)
+        D[t] = ([lengths[v] for v in order], order)
+    return D
+
+
+# ----------------------------------------------------------------------
+# helper: union-find with path compression (for residual components)
+# ----------------------------------------------------------------------
+def _find(parent, v):
+    root = v
+    while parent[root] != root:
+        root = parent[root]
+    while parent[v] != root:                 # path compression
+        parent[v], v = root, parent[v]
+    return root
+
+
+def residual_components(G, residual_nodes):
+    """
+    Connected components of G restricted to `residual_nodes`, via
+    union-find over the adjacency dict — no subgraph view, no Python
+    DFS traversal.
+    """
+    parent = {v: v for v in residual_nodes}
+    for u in residual_nodes:
+        for v in G._adj[u]:
+            if v in parent:
+                ru, rv = _find(parent, u), _find(parent, v)
+                if ru != rv:
+                    parent[rv] = ru
+
+    comps = defaultdict(set)
+    for v in residual_nodes:
+        comps[_find(parent, v)].add(v)
+    return comps.values()
+
+
 # ----------------------------------------------------------------------
 # helper: CKR–style random partition at scale Δ
 # ----------------------------------------------------------------------
-def sample_partition(G, terminals, Delta, weight="weight"):
+def sample_partition(D, terminals, Delta):
     """
     One random  (β ≈ O(log k))  partition that
       – puts every terminal in its own cluster
       – cluster diameter ≤ Delta
       – returns {terminal : set(vertices)}
     Implementation: each terminal grows a ball by an independent
-    random radius R_t ~ U[Delta/2, Delta].
-    Vertices are claimed by the *first* terminal (in a random order)
-    whose ball reaches them.
+    random radius R_t ~ U[Delta/2, Delta]; a vertex goes to the
+    terminal that reaches it first in the radius-offset priority order
+    (smallest dist - R_t, the Bartal/CKR rule).  All balls are merged
+    in one heap pass over the precomputed distance lists in `D`
+    (see `terminal_distances`) — no Dijkstra at any scale.
     """
-    order = terminals[:]
-    random.shuffle(order)
     # independent random radii in [Δ/2, Δ]
     radii = {t: (Delta / 2.0) + random.random() * (Delta / 2.0)
              for t in terminals}
 
+    # lazy k-way merge: heap entries are (dist - R_t, terminal, position)
+    heap = []
+    for t in terminals:
+        dists, _ = D[t]
+        if dists and dists[0] <= radii[t]:
+            heapq.heappush(heap, (dists[0] - radii[t], t, 0))
+
     cluster_of = {}                 # v -> owning terminal
-    for t in order:
-        # grow ball of radius radii[t], but only over *unclaimed* vertices
-        for v, dist in nx.single_source_dijkstra_path_length(
-                G, t, cutoff=radii[t], weight=weight).items():
-            if v not in cluster_of:          # first come, first served
-                cluster_of[v] = t
+    while heap:
+        prio, t, pos = heapq.heappop(heap)
+        dists, verts = D[t]
+        v = verts[pos]
+        if v not in cluster_of:              # first reached, first served
+            cluster_of[v] = t
+        pos += 1
+        if pos < len(dists) and dists[pos] <= radii[t]:
+            heapq.heappush(heap, (dists[pos] - radii[t], t, pos))
 
     clusters = defaultdict(set)
     for v, t in cluster_of.items():
@@ -55,11 +118,14 @@ def connected_zero_extension(G, terminals, *, weight="weight", verbose=False):
     unmapped = set(G.nodes) - set(terminals)
     i = 0
 
+    # one Dijkstra per terminal, shared by every scale below
+    D = terminal_distances(G, terminals, weight=weight)
+
     # -------- main loop over scales 2^i --------
     while unmapped:
         Delta = 2 ** i
         # random β-decomposition for the current scale
-        clusters = sample_partition(G, terminals, Delta, weight=weight)
+        clusters = sample_partition(D, terminals, Delta)
 
         for t, C in clusters.items():
             has_mapped = any(v not in unmapped for v in C)
@@ -74,9 +140,8 @@ def connected_zero_extension(G, terminals, *, weight="weight", verbose=False):
             if not residual_nodes:
                 continue
 
-            # induced subgraph of the residual, find its connected components
-            residual_sub = G.subgraph(residual_nodes)
-            for comp in nx.connected_components(residual_sub):
+            # connected components of the residual, via union-find
+            for comp in residual_components(G, residual_nodes):
                 # pick any deleted neighbour as boundary witness;
                 # here we choose the first vertex in comp that has
                 # an edge to *any* deleted node (guaranteed to exist)
@@ -100,24 +165,36 @@ def connected_zero_extension(G, terminals, *, weight="weight", verbose=False):
     # ------------------------------------------------------------------
     # build sparsifier H on terminals (capacities + distances)
     # ------------------------------------------------------------------
-    capacity = defaultdict(float)            # (t1,t2) unordered -> cap
-    for u, v, data in G.edges(data=True):
-        t1, t2 = f[u], f[v]
-        if t1 is None or t2 is None or t1 == t2:
-            continue
-        key = tuple(sorted((t1, t2)))
-        cap = data.get(weight, 1.0)
-        capacity[key] += cap
+    # aggregate crossing-edge capacities in one np.add.at call instead of
+    # a per-edge dict-probe loop
+    nodes = list(G)
+    k = len(terminals)
+    term_id = {t: i for i, t in enumerate(terminals)}
+    fi = np.fromiter((term_id.get(f[v], -1) for v in nodes),
+                     dtype=np.int32, count=len(nodes))
+
+    coo = sp.triu(nx.to_scipy_sparse_array(G, nodelist=nodes, weight=weight,
+                                           format="csr"), format="coo")
+    fu, fv = fi[coo.row], fi[coo.col]
+    mask = (fu >= 0) & (fv >= 0) & (fu != fv)
+    a, b = np.minimum(fu, fv)[mask], np.maximum(fu, fv)[mask]
+
+    cap_mat = np.zeros((k, k))               # (t1,t2) unordered -> cap
+    np.add.at(cap_mat, (a, b), coo.data[mask])
 
     H = nx.Graph()
     H.add_nodes_from(terminals)
 
-    # all-pairs terminal distances for the 'weight' attribute
-    term_dists = dict(nx.all_pairs_dijkstra_path_length(G, weight=weight))
+    # terminal-terminal distances for the 'weight' attribute, read off the
+    # Dijkstra maps cached in D (no all-pairs computation needed)
+    term_set = set(terminals)
+    term_dists = {t: {v: d for d, v in zip(*D[t]) if v in term_set}
+                  for t in terminals}
 
-    for (t1, t2), cap in capacity.items():
+    for i, j in zip(*np.nonzero(cap_mat)):
+        t1, t2 = terminals[i], terminals[j]
         H.add_edge(t1, t2,
-                   capacity=cap,
+                   capacity=cap_mat[i, j],
                    weight=term_dists[t1][t2])   # optional, for diagnostics
 
     return f, H
@@ -1,14 +1,51 @@
 # ----------------  Flow_Sparsifier.py  ----------------
 import math
+import os
 import random
 import time
-import heapq
 import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+from concurrent.futures import ProcessPoolExecutor
+from scipy.sparse.csgraph import minimum_spanning_tree, dijkstra
+
+# -----------------------------------------------------
+# per-worker sampling context (sent once per worker, not per sample)
+# -----------------------------------------------------
+_CTX = None
+
+def _init_ctx(ctx):
+    global _CTX
+    _CTX = ctx
+
+def _one_sample(seed):
+    """One random 0-decomposition tree; returns its k×k capacity matrix."""
+    A, inv, term_idx, slot, eu, ev, ecap, k, jitter = _CTX
+    rng = np.random.default_rng(seed)
+
+    # tiny noise so different trees appear across samples
+    A.data = inv * (1 + rng.uniform(0, jitter, inv.size))
+    T = minimum_spanning_tree(A)
+    # nearest terminal of every vertex in the tree metric, one C call;
+    # directed=False walks the one-sided MST output both ways, so no
+    # T + T.T symmetrization is needed
+    _, _, sources = dijkstra(T, directed=False, indices=term_idx,
+                             min_only=True, return_predecessors=True)
+
+    # aggregate capacities along original edges, vectorized
+    su, sv = sources[eu], sources[ev]
+    valid = (su >= 0) & (sv >= 0) & (su != sv)
+    a, b = slot[su[valid]], slot[sv[valid]]
+    W = np.zeros((k, k))
+    np.add.at(W, (np.minimum(a, b), np.maximum(a, b)), ecap[valid])
+    return W
+
 
 # -----------------------------------------------------
 # 0-decomposition tree sampler
 # -----------------------------------------------------
-def flow_sparsifier_min_cut(G, terminals, num_samples=None, jitter=0.01):
+def flow_sparsifier_min_cut(G, terminals, num_samples=None, jitter=0.01,
+                            workers=1, seed=None):
     """
     Vertex (cut) sparsifier à la Charikar-Leighton-Li-Moitra (2010).
 
@@ -24,6 +61,17 @@ def flow_sparsifier_min_cut(G, terminals, num_samples=None, jitter=0.01):
     jitter : float
         Small random multiplicative noise used when building each
         random minimum-spanning tree (gives us a distribution).
+    workers : int, optional
+        Process count for sampling the trees in parallel (they are
+        independent). Defaults to 1 (in-process) — parallelism is
+        opt-in because the spawn start method (macOS/Windows default)
+        re-imports the calling script in each worker, so callers must
+        be import-safe before passing workers > 1. Pass None to use
+        os.cpu_count().
+    seed : int, optional
+        Root seed for the per-sample jitter. Defaults to drawing from
+        the global `random` module, so runs after random.seed(...) are
+        repeatable.
 
     Returns
     -------
@@ -34,57 +82,46 @@ def flow_sparsifier_min_cut(G, terminals, num_samples=None, jitter=0.01):
     if num_samples is None:
         num_samples = int(math.ceil(math.log2(max(k, 2))) * 8)
 
-    # --- helper : get random spanning tree biased by capacities ---
-    def random_spanning_tree(G):
-        T = nx.Graph()
-        # copy edges with "length" = 1 / capacity  (high-cap ==> short)
-        for u, v, d in G.edges(data=True):
-            # add tiny noise so different trees appear across samples
-            length = (1.0 / d["capacity"]) * (1 + random.uniform(0, jitter))
-            T.add_edge(u, v, length=length, capacity=d["capacity"])
-        return nx.minimum_spanning_tree(T, weight="length")
-
-    # --- helper : assign every vertex to its nearest terminal in tree ---
-    def nearest_terminal_map(T):
-        dist = {v: float("inf") for v in T}
-        assign = {}                           # v ↦ terminal
-        pq = []
-
-        for t in terminals:
-            dist[t] = 0.0
-            assign[t] = t
-            heapq.heappush(pq, (0.0, t, t))   # (dist,node,origin_terminal)
-
-        while pq:
-            d, u, src = heapq.heappop(pq)
-            if d != dist[u]:
-                continue
-            assign[u] = src
-            for v in T.neighbors(u):
-                nd = d + (1.0 / T[u][v]["capacity"])
-                if nd < dist[v]:
-                    dist[v] = nd
-                    heapq.heappush(pq, (nd, v, src))
-        return assign
-
-    # ---------------- main loop: average sampled graphs ---------------
+    # --- one-off CSR conversion: all per-sample work runs in SciPy C ---
+    nodes = list(G)
+    n = len(nodes)
+    A = nx.to_scipy_sparse_array(G, nodelist=nodes, weight="capacity",
+                                 format="csr")
+    inv = 1.0 / A.data                        # "length" = 1 / capacity
+
+    idx = {v: i for i, v in enumerate(nodes)}
+    term_idx = np.array([idx[t] for t in terminals])
+    slot = np.full(n, -1, dtype=np.int64)     # node index -> terminal slot
+    slot[term_idx] = np.arange(k)
+
+    # original edges once, as arrays (upper triangle = each edge once)
+    coo = sp.triu(A, format="coo")
+    eu, ev, ecap = coo.row, coo.col, coo.data
+
+    # ------------- main loop: average sampled graphs in parallel -------
+    ctx = (A, inv, term_idx, slot, eu, ev, ecap, k, jitter)
+    if seed is None:
+        seed = random.getrandbits(128)        # follows the global seed
+    seeds = np.random.SeedSequence(seed).spawn(num_samples)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, num_samples)
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_ctx,
+                                 initargs=(ctx,)) as ex:
+            W = sum(ex.map(_one_sample, seeds))
+    else:
+        _init_ctx(ctx)
+        W = sum(_one_sample(s) for s in seeds)
+    W /= num_samples
+
     H = nx.Graph()
     H.add_nodes_from(terminals)
-
-    for _ in range(num_samples):
-        T = random_spanning_tree(G)
-        assign = nearest_terminal_map(T)
-
-        # Aggregate capacities along original edges
-        for u, v, d in G.edges(data=True):
-            a, b = assign[u], assign[v]
-            if a == b:                       # stays inside a cluster
-                continue
-            w = d["capacity"] / num_samples  # averaging factor
-            if H.has_edge(a, b):
-                H[a][b]["weight"] += w
-            else:
-                H.add_edge(a, b, weight=w)
+    for a, b in zip(*np.nonzero(W)):
+        H.add_edge(terminals[a], terminals[b], weight=W[a, b])
 
     return H
 
@@ -1,5 +1,6 @@
-import itertools
 import networkx as nx
+import numpy as np
+import scipy.sparse as sp
 import time
 
 
@@ -12,34 +13,36 @@ def _unique_perturbation(G, capacity='capacity', eps=1e-6):
     compared with any integer capacities.
     """
     m = G.number_of_edges()
-    delta = eps / m
-    for idx, (u, v, d) in enumerate(G.edges(data=True)):
-        d[capacity] += (idx + 1) * delta
+    edge_data = [d for _, _, d in G.edges(data=True)]
+    caps = np.fromiter((d[capacity] for d in edge_data),
+                       dtype=np.float64, count=m)
+    caps += (np.arange(m, dtype=np.float64) + 1) * (eps / m)  # broadcast
+    for d, c in zip(edge_data, caps):
+        d[capacity] = float(c)
 
 
-def _min_cut_sets(G, S, T, capacity='capacity'):
+def _fundamental_cuts(G, terminals, capacity='capacity'):
     """
-    Minimum cut that separates *sets* S and T
-    (classic supersource / supersink construction).
-    Returns both the value and the partition (A,B).
+    All fundamental cuts of a Gomory–Hu tree of G.
+
+    The GH tree captures every pairwise terminal minimum cut with only
+    |V|-1 max-flow computations, and the union of its fundamental cuts
+    supersets every terminal-bipartition minimum cut (submodularity
+    argument in the paper), so it replaces the 2^(k-1)-1 subset
+    enumeration.  Yields the partition (A,B) of every tree edge whose
+    removal actually separates two terminals.
     """
-    aux = G.copy()
-    s_sup, t_sup = '__S__', '__T__'
-    aux.add_node(s_sup)
-    aux.add_node(t_sup)
-
-    BIG = sum(d[capacity] for _, _, d in G.edges(data=True)) + 1
-    for v in S:
-        aux.add_edge(s_sup, v, **{capacity: BIG})
-    for v in T:
-        aux.add_edge(t_sup, v, **{capacity: BIG})
-
-    cut_val, (A, B) = nx.minimum_cut(aux, s_sup, t_sup, capacity=capacity)
-    A.discard(s_sup)
-    A.discard(t_sup)
-    B.discard(s_sup)
-    B.discard(t_sup)
-    return cut_val, (A, B)
+    # NB: stays on nx.gomory_hu_tree — the construction needs the exact
+    # min-cut partitions made unique by the perturbation, and the C++
+    # backend in fast_gomory_hu may return a different (value-equivalent)
+    # tree whose fundamental cuts differ.
+    T = nx.gomory_hu_tree(G, capacity=capacity)
+    for u, v in list(T.edges):
+        T.remove_edge(u, v)
+        A, B = (set(c) for c in nx.connected_components(T))
+        T.add_edge(u, v)
+        if A & terminals and B & terminals:
+            yield A, B
 
 
 # ------------- main routine ---------------------------------------------------
@@ -66,49 +69,55 @@ def mimicking_network(G_in, terminals, capacity='capacity'):
     G = G_in.copy()
     _unique_perturbation(G, capacity=capacity)
 
-    K = list(terminals)
-    Ė = set()                                  # union of all unique min-cut edge sets
-
-    for r in range(1, len(K)):                 # all non-trivial bipartitions
-        for subset in itertools.combinations(K, r):
-            S = set(subset)
-            T = terminals - S
-            _, (A, B) = _min_cut_sets(G, S, T, capacity=capacity)
-
-            # collect every edge crossing the unique min cut
-            for u in A:
-                for v, d in G[u].items():
-                    if v in B:
-                        Ė.add(tuple(sorted((u, v))))    # store as unordered pair
-
-    # --- delete non-Ė edges, then contract each component -------------
-    G_minus = G.copy()
-    for u, v in list(G_minus.edges):
-        if tuple(sorted((u, v))) not in Ė:
-            G_minus.remove_edge(u, v)
+    # one CSR extraction serves both the cut collection and the final
+    # aggregation: upper triangle, so each undirected edge appears once
+    nodes = list(G)
+    pos = {v: i for i, v in enumerate(nodes)}
+    coo = sp.triu(nx.to_scipy_sparse_array(G, nodelist=nodes, weight=capacity,
+                                           format="csr"), format="coo")
+    erow, ecol, ecap = coo.row, coo.col, coo.data
+
+    # union of all unique min-cut edge sets, as a mask over the edge arrays
+    in_cut = np.zeros(erow.size, dtype=bool)
+    side = np.zeros(len(nodes), dtype=bool)
+    for A, B in _fundamental_cuts(G, terminals, capacity=capacity):
+        side[:] = False
+        side[[pos[v] for v in A]] = True
+        in_cut |= side[erow] != side[ecol]     # edges crossing this cut
+
+    # --- keep only cut edges, then contract each component ------------
+    # built directly instead of copying G and deleting the complement
+    G_minus = nx.Graph()
+    G_minus.add_nodes_from(G)
+    G_minus.add_edges_from((nodes[i], nodes[j])
+                           for i, j in zip(erow[in_cut], ecol[in_cut]))
 
     components = list(nx.connected_components(G_minus))
     repr_of = {}                                # map original node -> component label
+    labels = []                                 # component index -> label
     H = nx.Graph()
 
     for idx, comp in enumerate(components):
         label = next(iter(comp & terminals), f"c{idx}")  # keep a terminal name if any
         H.add_node(label)
+        labels.append(label)
         for n in comp:
-            repr_of[n] = label
+            repr_of[n] = idx
 
     # --- rebuild edges with aggregated capacities ---------------------
-    for u, v, d in G.edges(data=True):
-        a, b = repr_of[u], repr_of[v]
-        if a == b:
-            continue
-        w = d[capacity]
-        if H.has_edge(a, b):
-            H[a][b][capacity] += w
-        else:
-            H.add_edge(a, b, **{capacity: w})
-
-
+    # one np.add.at over the edge arrays instead of per-edge dict probes
+    ci = np.fromiter((repr_of[v] for v in nodes),
+                     dtype=np.int32, count=len(nodes))
+    cu, cv = ci[erow], ci[ecol]
+    mask = cu != cv
+    a, b = np.minimum(cu, cv)[mask], np.maximum(cu, cv)[mask]
+
+    cap_mat = np.zeros((len(components), len(components)))
+    np.add.at(cap_mat, (a, b), ecap[mask])
+    for i, j in zip(*np.nonzero(cap_mat)):
+        H.add_edge(labels[i], labels[j], **{capacity: cap_mat[i, j]})
+
+    repr_of = {v: labels[c] for v, c in repr_of.items()}
     return (H, repr_of)
 
 
@@ -1,21 +1,45 @@
-from pyvis.network import Network
-import networkx as nx
-
-def show_interactive(G, name="graph", physics=True, notebook=False,
-                     edge_attr="weight", highlight_terminals=None):
-
-    nt = Network(height="620px", width="100%",neighborhood_highlight=True,
-                 directed=G.is_directed(), notebook=False)
-    nt.barnes_hut() if physics else nt.force_atlas_2based()
-
-    # --- nodes
-    for v in G.nodes:
-        color = "tab:red" if highlight_terminals and v in highlight_terminals else None
-        nt.add_node(v, label=str(v), color=color)
-
-    # --- edges
-    for u, v, d in G.edges(data=True):
-        hover = f"{edge_attr}={d[edge_attr]}" if edge_attr and edge_attr in d else ""
-        nt.add_edge(u, v, title=hover)
-
-    nt.show(f"{name}.html", notebook=False)         
\ No newline at end of file
+import hashlib
+import os
+import pickle
+
+from pyvis.network import Network
+import networkx as nx
+
+def show_interactive(G, name="graph", physics=True, notebook=False,
+                     edge_attr="weight", highlight_terminals=None):
+
+    # skip the pyvis template rendering + disk write when the graph is
+    # unchanged since the last call; a sidecar file remembers the digest
+    path = f"{name}.html"
+    sidecar = f"{name}.html.md5"
+    # sort by repr — node labels can mix ints and strings (e.g. the
+    # mimicking network's contracted "c0" components)
+    digest = hashlib.md5(pickle.dumps((sorted(G.nodes, key=repr),
+                                       sorted(G.edges(data=True), key=repr),
+                                       edge_attr,
+                                       sorted(highlight_terminals or [],
+                                              key=repr)))
+                         ).hexdigest()
+    if os.path.exists(path) and os.path.exists(sidecar):
+        with open(sidecar) as fh:
+            if fh.read() == digest:
+                return
+
+    nt = Network(height="620px", width="100%",neighborhood_highlight=True,
+                 directed=G.is_directed(), notebook=False)
+    nt.barnes_hut() if physics else nt.force_atlas_2based()
+
+    # --- nodes
+    for v in G.nodes:
+        color = "tab:red" if highlight_terminals and v in highlight_terminals else None
+        nt.add_node(v, label=str(v), color=color)
+
+    # --- edges
+    for u, v, d in G.edges(data=True):
+        hover = f"{edge_attr}={d[edge_attr]}" if edge_attr and edge_attr in d else ""
+        nt.add_edge(u, v, title=hover)
+
+    # write without spawning a browser tab per call
+    nt.write_html(path, notebook=False, open_browser=False)
+    with open(sidecar, "w") as fh:
+        fh.write(digest)